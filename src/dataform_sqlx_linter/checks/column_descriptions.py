@@ -1,5 +1,5 @@
 from __future__ import annotations
-from typing import List, Any
+from typing import Any, Dict, List, Optional
 
 from ..utils.io import (
     load_compiled_graph,
@@ -16,12 +16,14 @@ def _path_to_str(path: Any) -> str:
     return "[unknown]"
 
 
-def run(files: List[str]) -> int:
-    try:
-        graph = load_compiled_graph()
-    except GraphLoadError as e:
-        p.error(str(e))
-        return 1
+@p.batch()
+def run(files: List[str], graph: Optional[Dict] = None, *, fail_fast: bool = False) -> int:
+    if graph is None:
+        try:
+            graph = load_compiled_graph()
+        except GraphLoadError as e:
+            p.error(str(e))
+            return 1
 
     has_errors = False
 
@@ -37,6 +39,8 @@ def run(files: List[str]) -> int:
         if not isinstance(columns, list) or not columns:
             p.error(f"{file_name} is missing defined columns.")
             has_errors = True
+            if fail_fast:
+                break
             continue
 
         for col in columns:
@@ -45,6 +49,11 @@ def run(files: List[str]) -> int:
                 col_path = _path_to_str(col.get("path"))
                 p.error(f"Column \"{col_path}\" in {file_name} is missing a description.")
                 has_errors = True
+                if fail_fast:
+                    break
+
+        if has_errors and fail_fast:
+            break
 
     if has_errors:
         p.footer_fail("Some SQLX files are missing column descriptions.")
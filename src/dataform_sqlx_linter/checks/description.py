@@ -1,15 +1,17 @@
 from __future__ import annotations
-from typing import List
+from typing import Dict, List, Optional
 from ..utils.io import load_compiled_graph, iter_tables_for_files, get_lifecycle_stage, GraphLoadError
 from ..utils.printing import PRINTER as p
 
 
-def run(files: List[str]) -> int:
-    try:
-        graph = load_compiled_graph()
-    except GraphLoadError as e:
-        p.error(str(e))
-        return 1
+@p.batch()
+def run(files: List[str], graph: Optional[Dict] = None, *, fail_fast: bool = False) -> int:
+    if graph is None:
+        try:
+            graph = load_compiled_graph()
+        except GraphLoadError as e:
+            p.error(str(e))
+            return 1
 
     has_errors = False
 
@@ -22,6 +24,8 @@ def run(files: List[str]) -> int:
             if lifecycle != "draft":
                 p.error(f"Missing description in {file_name}")
                 has_errors = True
+                if fail_fast:
+                    break
             else:
                 p.skip(f"Skipped {file_name} (lifecycle_stage is draft)")
 
@@ -1,25 +1,30 @@
 from __future__ import annotations
+import re
+from concurrent.futures import ProcessPoolExecutor
+from functools import lru_cache
 from pathlib import Path
 from typing import Any
 
-import sqlglot
 from sqlglot import exp
+from sqlglot.dialects.dialect import Dialect
 
 from ..utils.io import (
+    DEFAULT_GRAPH_PATH,
+    display_name,
     load_compiled_graph,
     GraphLoadError,
 )
 from ..utils.printing import PRINTER as p
 
+# Built once and reused for every action: sqlglot.parse_one would resolve the dialect and
+# construct a fresh tokenizer and parser on each call.
+_BQ = Dialect.get_or_raise("bigquery")
+_TOKENIZER = _BQ.tokenizer_class(dialect=_BQ)
+_PARSER = _BQ.parser_class(dialect=_BQ)
 
-def _display_name(file_path: str) -> str:
-    """Return relative path if inside cwd, else basename."""
-    pth = Path(file_path)
-    try:
-        rel = pth.resolve().relative_to(Path.cwd().resolve())
-        return str(rel)
-    except Exception:
-        return pth.name
+# Parsing is pure-Python and CPU-bound; below this many distinct queries that the regex
+# scan cannot answer, a process pool costs more to start than it saves.
+_PARALLEL_MIN_QUERIES = 32
 
 
 def _target_to_fqn(target: dict[str, Any] | None) -> str:
@@ -41,98 +46,251 @@ def _target_to_fqn(target: dict[str, Any] | None) -> str:
 def _normalize_bq_table(table_expr: exp.Table) -> str:
     """
     Convert a sqlglot Table node into 'project.dataset.table' or 'dataset.table'.
+    sqlglot already unquotes identifiers, so the parts are used as-is (this runs per node).
     """
-    proj = (table_expr.catalog or "").strip("`")  # BigQuery: catalog == project
-    ds = (table_expr.db or "").strip("`")        # BigQuery: db == dataset
-    nm = (table_expr.name or "").strip("`")      # table name
+    proj = table_expr.catalog  # BigQuery: catalog == project
+    ds = table_expr.db         # BigQuery: db == dataset
+    nm = table_expr.name       # table name
     if not ds or not nm:
         return ""
     return f"{proj}.{ds}.{nm}" if proj else f"{ds}.{nm}"
 
 
-def _collect_cte_names(tree: exp.Expression) -> set[str]:
-    names: set[str] = set()
-    for cte in tree.find_all(exp.CTE):
-        alias = cte.alias
-        if alias:
-            names.add(alias)
-    return names
+# Statements whose `this` is the table being written, not read
+_WRITE_STATEMENTS = (exp.Create, exp.Insert, exp.Copy)
 
 
-def _is_write_target(table_expr: exp.Table) -> bool:
+def _collect_read_tables(tree: exp.Expression, results: set[str]) -> None:
     """
-    Return True only if this Table node is the actual write target of a CREATE/INSERT/COPY.
-    For CTAS (CREATE TABLE t AS SELECT ... FROM s), skip only `t` (the target), not `s`.
+    Single preorder walk over `tree` adding read-position tables to `results`.
+    A CREATE/INSERT/COPY is visited before its children, so the id() of its target (`this`)
+    is already in `write_targets` when that Table is reached: an O(1) check instead of
+    walking back up the parents. For CTAS (CREATE TABLE t AS SELECT ... FROM s), only `t`
+    (the target) is skipped, not `s`. CTE aliases are recorded on the way and references
+    to them are dropped once the walk is done.
     """
-    create = table_expr.find_ancestor(exp.Create)
-    if create is not None:
-        # In sqlglot, the target of CREATE is `create.this`
-        return create.this is table_expr
+    cte_names: set[str] = set()
+    write_targets: set[int] = set()
+    candidates: list[exp.Table] = []
+    stack: list[exp.Expression] = [tree]
+
+    while stack:
+        node = stack.pop()
+        if isinstance(node, _WRITE_STATEMENTS):
+            write_targets.add(id(node.this))
+        elif isinstance(node, exp.CTE):
+            if node.alias:
+                cte_names.add(node.alias)
+        elif isinstance(node, exp.Table):
+            if id(node) not in write_targets:
+                candidates.append(node)
+        stack.extend(node.iter_expressions())
+
+    for t in candidates:
+        # Skip CTE references
+        if (t.name or "") in cte_names:
+            continue
+        fqn = _normalize_bq_table(t)
+        if fqn:
+            results.add(fqn)
+
+
+# --- Regex fast path ------------------------------------------------------------------
+# Most compiled queries are plain SELECTs whose tables all follow FROM/JOIN. For those a
+# few regexes find the same tables as the parser at a fraction of the cost. Anything that
+# could mislead them (DML/DDL/scripting, comma joins, parenthesized joins, table functions,
+# correlated array paths, FROM inside expressions, INFORMATION_SCHEMA, ...) is left to
+# sqlglot.
+
+_LITERALS_AND_COMMENTS_RE = re.compile(
+    r"`[^`]*`"                                      # quoted identifier (kept)
+    r"|'''.*?'''|\"\"\".*?\"\"\""                   # triple-quoted strings
+    r"|'(?:[^'\\\n]|\\.)*'|\"(?:[^\"\\\n]|\\.)*\""  # strings
+    r"|--[^\n]*|#[^\n]*|/\*.*?\*/",                 # comments
+    re.DOTALL,
+)
+_NEEDS_PARSER_RE = re.compile(
+    r"\b(?:CREATE|INSERT|COPY|MERGE|UPDATE|DELETE|TRUNCATE|DECLARE|EXECUTE|CALL|BEGIN"
+    r"|UNNEST|PIVOT|UNPIVOT|EXTRACT|TRIM|SUBSTRING|OVERLAY|DISTINCT\s+FROM"
+    r"|INFORMATION_SCHEMA)\b",
+    re.IGNORECASE,
+)
+# Tokens that open or close a FROM clause or a nesting level, for _has_comma_join
+_FROM_SCOPE_RE = re.compile(
+    r"\b(?:FROM|WHERE|GROUP|HAVING|QUALIFY|WINDOW|ORDER|LIMIT|UNION|INTERSECT|EXCEPT|SELECT)\b"
+    r"|[()\[\],;]",
+    re.IGNORECASE,
+)
+# A parenthesized FROM item that is not a subquery: `FROM (a JOIN b ON ...)`, `FROM ((a))`
+_PAREN_FROM_ITEM_RE = re.compile(r"\b(?:FROM|JOIN)\s*\((?!\s*(?:SELECT|WITH)\b)", re.IGNORECASE)
+_IDENT_PART = r"(?:`[^`]+`|[A-Za-z_][\w-]*)"
+# Parts after a dot may start with a digit: `ext.2023_events`
+_REF = rf"{_IDENT_PART}(?:\s*\.\s*(?:`[^`]+`|[\w-]+))*"
+_TABLE_REF_RE = re.compile(
+    rf"\b(?:FROM|JOIN)\s+(?P<ref>{_REF})(?:(?P<call>\s*\()|(?P<more>\s*\.))?", re.IGNORECASE
+)
+# Names a FROM item can be referred to by: `AS x`, `(...) x` and `FROM tbl x`. Over-matching
+# (column aliases, keywords) only sends more queries to the parser.
+_ALIAS_RE = re.compile(
+    rf"(?:\bAS\b|\))(?=\s+`?(\w+))|\b(?:FROM|JOIN)\s+(?={_REF}\s+`?(\w+))", re.IGNORECASE
+)
+_REF_DOT_RE = re.compile(r"\s*\.\s*")
+_CTE_NAME_RE = re.compile(r"(?:\bWITH(?:\s+RECURSIVE)?|,)\s*`?(\w+)`?\s+AS\s*\(", re.IGNORECASE)
 
-    insert = table_expr.find_ancestor(exp.Insert)
-    if insert is not None:
-        # In sqlglot, the target of INSERT is `insert.this`
-        return insert.this is table_expr
 
-    copy = table_expr.find_ancestor(exp.Copy)
-    if copy is not None:
-        # Target of COPY is `copy.this`
-        return copy.this is table_expr
+def _keep_quoted_identifiers(m: re.Match[str]) -> str:
+    text = m.group()
+    return text if text.startswith("`") else " "
 
-    return False
 
+def _has_comma_join(code: str) -> bool:
+    """
+    True if a FROM clause lists items with a comma at its own nesting level (`FROM a, b`,
+    or after a join's ON/USING condition); _TABLE_REF_RE would miss the items after it.
+    """
+    in_from = [False]  # one entry per open bracket
+    for m in _FROM_SCOPE_RE.finditer(code):
+        token = m.group()
+        if token in ("(", "["):
+            in_from.append(False)
+        elif token in (")", "]"):
+            if len(in_from) > 1:
+                in_from.pop()
+        elif token == ",":
+            if in_from[-1]:
+                return True
+        elif token == ";":
+            in_from = [False]
+        else:
+            in_from[-1] = token.upper() == "FROM"
+    return False
 
 
-def _extract_read_tables(sql: str) -> set[str]:
+def _scan_read_tables(sql: str) -> frozenset[str] | None:
     """
-    Parse BigQuery SQL and return set of table identifiers used in read positions.
-    Filters:
-      - write targets (CREATE/INSERT/COPY)
-      - CTE references
-      - INFORMATION_SCHEMA
+    Regex-only equivalent of _parse_read_tables for simple SELECT queries.
+    Returns None when the query is not simple enough to be sure of the answer.
     """
-    if not (sql and sql.strip()):
-        return set()
+    code = _LITERALS_AND_COMMENTS_RE.sub(_keep_quoted_identifiers, sql)
+    if (
+        _NEEDS_PARSER_RE.search(code)
+        or _PAREN_FROM_ITEM_RE.search(code)
+        or _has_comma_join(code)
+    ):
+        return None
+
+    refs: list[list[str]] = []
+    for m in _TABLE_REF_RE.finditer(code):
+        if m.group("call"):
+            return None  # table-valued function
+        if m.group("more"):
+            return None  # a path part the pattern does not cover
+        # `proj.ds.tbl`, `proj`.ds.tbl, proj.ds.tbl ... -> ["proj", "ds", "tbl"]
+        parts = [
+            piece
+            for part in _REF_DOT_RE.split(m.group("ref"))
+            for piece in part.strip("`").split(".")
+        ]
+        if len(parts) > 3 or not all(parts):
+            return None
+        refs.append(parts)
+
+    cte_names = set(_CTE_NAME_RE.findall(code))
+    # A path starting with a FROM item's name (`JOIN o.items`) is a correlated array
+    # reference, not a table; items are also named by their table when not aliased.
+    aliases = {name.lower() for pair in _ALIAS_RE.findall(code) for name in pair if name}
+    aliases.update(name.lower() for name in cte_names)
+    aliases.update(parts[-1].lower() for parts in refs)
+
+    results: set[str] = set()
+    for parts in refs:
+        if len(parts) < 2:
+            continue
+        if parts[0].lower() in aliases:
+            return None
+        if parts[-1] not in cte_names:
+            results.add(".".join(parts))
+    return frozenset(results)
+
 
+@lru_cache(maxsize=512)
+def _parse_read_tables(sql: str) -> frozenset[str]:
+    """
+    Parse BigQuery SQL with sqlglot and return the table identifiers used in read positions.
+    Memoized on the SQL text: identical compiled queries are only parsed once. Only the
+    (immutable) result is cached, not the sqlglot tree.
+    """
     try:
-        tree = sqlglot.parse_one(sql, read="bigquery")
+        statements = [s for s in _PARSER.parse(_TOKENIZER.tokenize(sql), sql) if s is not None]
     except Exception:
         # If parsing fails, be conservative and return empty (avoid false positives)
-        return set()
+        return frozenset()
 
-    cte_names = _collect_cte_names(tree)
     results: set[str] = set()
+    for tree in statements:
+        _collect_read_tables(tree, results)
+    return frozenset(results)
 
-    for t in tree.find_all(exp.Table):
-        # Skip CTE references
-        if (t.name or "") in cte_names:
-            continue
-        # Skip write targets
-        if _is_write_target(t):
-            continue
-        fqn = _normalize_bq_table(t)
-        if not fqn:
-            continue
-        results.add(fqn)
 
-    return results
+def _extract_read_tables(sql: str) -> frozenset[str]:
+    """
+    Return set of table identifiers used in read positions of BigQuery SQL.
+    Filters:
+      - write targets (CREATE/INSERT/COPY)
+      - CTE references
+    Simple queries are answered by a regex scan; everything else is parsed with sqlglot.
+    """
+    if not (sql and sql.strip()):
+        return frozenset()
+
+    fast = _scan_read_tables(sql)
+    if fast is not None:
+        return fast
+    return _parse_read_tables(sql)
+
+
+def _extract_all(sqls: list[str]) -> list[frozenset[str]]:
+    """
+    _extract_read_tables over `sqls` (results in the same order). Distinct queries are
+    extracted once. The regex scan runs inline; only the queries it defers are parsed,
+    across a process pool when there are enough of them.
+    """
+    by_sql: dict[str, frozenset[str]] = {}
+    deferred: list[str] = []
+    for sql in dict.fromkeys(sqls):
+        fast = _scan_read_tables(sql)
+        if fast is None:
+            deferred.append(sql)
+        else:
+            by_sql[sql] = fast
+
+    if len(deferred) < _PARALLEL_MIN_QUERIES:
+        by_sql.update((sql, _parse_read_tables(sql)) for sql in deferred)
+    else:
+        with ProcessPoolExecutor() as ex:
+            by_sql.update(zip(deferred, ex.map(_parse_read_tables, deferred, chunksize=8)))
+    return [by_sql[sql] for sql in sqls]
+
+
+def _graph_actions(graph: dict[str, Any]) -> list[dict[str, Any]]:
+    return (
+        graph.get("actions")  # some Dataform versions
+        or graph.get("tables")  # others
+        or []
+    )
 
 
 def _index_actions(
     graph: dict[str, Any],
-) -> tuple[dict[str, dict[str, Any]], dict[str, str], set[str], dict[str, list[str]]]:
+) -> tuple[dict[str, dict[str, Any]], dict[str, str], frozenset[str], dict[str, list[str]]]:
     """
     Build indices:
       - by_name: name -> action dict
       - name_to_fqn: name -> canonical FQN (for relations with a target)
-      - source_fqns: set of declared sources' FQNs (if available)
+      - source_fqns: frozenset of declared sources' FQNs (if available)
       - by_file: fileName -> list of action names (to filter by file list)
     """
-    actions: list[dict[str, Any]] = (
-        graph.get("actions")  # some Dataform versions
-        or graph.get("tables")  # others
-        or []
-    )
+    actions = _graph_actions(graph)
 
     by_name: dict[str, dict[str, Any]] = {}
     name_to_fqn: dict[str, str] = {}
@@ -154,11 +312,11 @@ def _index_actions(
         if isinstance(fn, str):
             by_file.setdefault(fn, []).append(name)
 
-    source_fqns: set[str] = set()
-    for src in graph.get("sources", []):
-        fqn = _target_to_fqn(src.get("target") or {})
-        if fqn:
-            source_fqns.add(fqn)
+    source_fqns = frozenset(
+        fqn
+        for src in graph.get("sources", [])
+        if (fqn := _target_to_fqn(src.get("target") or {}))
+    )
 
     return by_name, name_to_fqn, source_fqns, by_file
 
@@ -181,54 +339,81 @@ def _action_dependencies(a: dict[str, Any]) -> list[str]:
     return []
 
 
-def run(files: list[str]) -> int:
+@p.batch()
+def run(
+    files: list[str],
+    graph: dict[str, Any] | None = None,
+    *,
+    fail_fast: bool = False,
+    cwd: Path | None = None,
+) -> int:
     """
     Return 1 if any action (within the provided files) appears to use hard-coded FQNs
     (i.e., referenced tables not covered by dependencies or declared sources). Else 0.
+    `graph` is the parsed compiled graph; it is loaded from disk when not supplied.
+    `cwd` is the project directory (default: the current directory): the graph is read
+    from its compiled_graph.json and file names are displayed relative to it.
+    With `fail_fast`, queries are parsed lazily and checking stops at the first offender.
     """
-    try:
-        graph = load_compiled_graph()
-    except GraphLoadError as e:
-        p.error(str(e))
-        return 1
-
-    by_name, name_to_fqn, source_fqns, by_file = _index_actions(graph)
-
-    # Build the set of action names to check based on files provided.
-    to_check: set[str] = set()
-    for f in files:
-        if f in by_file:
-            to_check.update(by_file[f])
+    base = cwd or Path.cwd()
+    if graph is None:
+        try:
+            graph = load_compiled_graph(base / DEFAULT_GRAPH_PATH)
+        except GraphLoadError as e:
+            p.error(str(e))
+            return 1
+
+    # Indexed once per graph: later runs against the same graph reuse it. Before building
+    # it, a plain fileName scan rules out the common case of no action in the given files.
+    index = graph.get("__fqn_index")
+    if index is None:
+        wanted = set(files)
+        if any(
+            fn in wanted
+            for a in _graph_actions(graph)
+            if isinstance(fn := a.get("fileName"), str)
+        ):
+            index = graph["__fqn_index"] = _index_actions(graph)
+
+    if index is None:
+        to_check = []
+    else:
+        by_name, name_to_fqn, source_fqns, by_file = index
+        # Action names to check based on files provided (ordered by file, without duplicates).
+        to_check = list(dict.fromkeys(name for f in files for name in by_file.get(f, ())))
 
     if not to_check:
         # Nothing to check (no actions found for given files)
         p.success("No actions found for provided files; nothing to check.")
         return 0
 
-    has_errors = False
-
-    for action_name in sorted(to_check):
-        a = by_name.get(action_name, {})
-        file_name = a.get("fileName") or action_name
-        display = _display_name(file_name)
-
-        sql = _action_query(a)
-        parsed_tables = _extract_read_tables(sql)
+    actions = [by_name.get(action_name, {}) for action_name in to_check]
+    sqls = [_action_query(a) for a in actions]
+    parsed = map(_extract_read_tables, sqls) if fail_fast else _extract_all(sqls)
 
-        deps = set(_action_dependencies(a))
-        dep_fqns = {name_to_fqn[d] for d in deps if d in name_to_fqn}
-        accounted = set(dep_fqns) | source_fqns
-
-        suspects = {t for t in parsed_tables if t not in accounted}
+    # (action name, message); sorted before printing so output order is deterministic
+    errors: list[tuple[str, str]] = []
+    for action_name, a, parsed_tables in zip(to_check, actions, parsed):
+        # Membership tests against the shared source set; no per-action union copy of it
+        suspects = {t for t in parsed_tables if t not in source_fqns}
+        if suspects:
+            dep_fqns = {name_to_fqn[d] for d in _action_dependencies(a) if d in name_to_fqn}
+            suspects -= dep_fqns
 
         if suspects:
-            has_errors = True
-            p.error(
+            display = display_name(a.get("fileName") or action_name, base)
+            errors.append((
+                action_name,
                 f"{display}: suspected hard-coded table references "
-                f"(use ref()): {', '.join(sorted(suspects))}"
-            )
+                f"(use ref()): {', '.join(sorted(suspects))}",
+            ))
+            if fail_fast:
+                break
+
+    for _, msg in sorted(errors):
+        p.error(msg)
 
-    if has_errors:
+    if errors:
         p.footer_fail("Some SQLX files use fully-qualified tables instead of ref().")
         return 1
 
@@ -1,93 +1,227 @@
 from __future__ import annotations
+import codecs
+import os
 import re
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import closing
+from itertools import repeat
 from pathlib import Path
-from typing import List, Optional
+from typing import Dict, Generator, List, Optional
 
+from ..utils.io import display_name
 from ..utils.printing import PRINTER as p
 
-SCHEMA_RE = re.compile(r'\bschema\s*:\s*(["\'])(?P<val>[^"\']+)\1')
-TYPE_RE = re.compile(r'\btype\s*:\s*(["\']?)(?P<val>[a-zA-Z_]+)\1')
+# `type:` (optionally quoted) and explicitly quoted `schema:` keys, matched in a single scan
+CONFIG_KEY_RE = re.compile(
+    r'\btype\s*:\s*(["\']?)(?P<type>[a-zA-Z_]+)\1'
+    r'|\bschema\s*:\s*(["\'])(?P<schema>[^"\']+)\3'
+)
 VALID_TYPES = {"view", "table", "incremental"}
+# The config block sits at the top of a SQLX file; read this much before reading the rest
+HEAD_BYTES = 8192
 
+_CONFIG_START_RE = re.compile(r"\bconfig\s*\{")
+_COMMENT_OR_QUOTE_RE = re.compile(r"""/[/*]|["'`]""")
+_BRACE_COMMENT_OR_QUOTE_RE = re.compile(r"""[{}]|/[/*]|["'`]""")
 
-def _extract_config_block(content: str) -> Optional[str]:
-    start = content.find("config {")
-    if start == -1:
-        return None
 
-    brace_count = 0
-    start_idx = -1
-    end_idx = -1
-
-    for i in range(start, len(content)):
-        ch = content[i]
-        if ch == "{":
-            brace_count += 1
-            if start_idx == -1:
-                start_idx = i
-        elif ch == "}":
-            brace_count -= 1
-            if brace_count == 0:
-                end_idx = i
-                break
-
-    if start_idx == -1 or end_idx == -1:
+def _extract_config_block(content: str) -> Optional[str]:
+    """
+    Return the body of the first `config { ... }` block, or None if there is none or it
+    is not closed. Braces inside comments and quoted strings do not count towards the
+    balance; the walk is linear and returns as soon as the input runs out.
+    """
+    m = _CONFIG_START_RE.search(content)
+    if m is None:
         return None
 
-    return content[start_idx + 1 : end_idx].strip()
+    start_idx = m.end() - 1
+    depth = 1
+    i = m.end()
+    # Jump from token to token instead of visiting every character
+    while True:
+        t = _BRACE_COMMENT_OR_QUOTE_RE.search(content, i)
+        if t is None:
+            return None
+        j = t.start()
+        token = t.group()
+        if token == "{":
+            depth += 1
+            i = j + 1
+        elif token == "}":
+            depth -= 1
+            if not depth:
+                return content[start_idx + 1 : j].strip()
+            i = j + 1
+        elif token == "/*":
+            k = content.find("*/", j + 2)
+            if k == -1:
+                return None
+            i = k + 2
+        elif token == "//":
+            k = content.find("\n", j + 2)
+            if k == -1:
+                return None
+            i = k + 1
+        else:
+            i = _end_of_string(content, j)
+
+
+def _end_of_string(text: str, start: int) -> int:
+    """Index just past the quoted string opening at `start` (len(text) if unterminated)."""
+    quote = text[start]
+    k = start + 1
+    while True:
+        k = text.find(quote, k)
+        if k == -1:
+            return len(text)
+        backslashes = k - 1
+        while text[backslashes] == "\\":
+            backslashes -= 1
+        if (k - 1 - backslashes) % 2 == 0:  # quote is not escaped
+            return k + 1
+        k += 1
 
 
 def _strip_js_comments(text: str) -> str:
-    text = re.sub(r"/\*.*?\*/", "", text, flags=re.DOTALL)       # /* ... */
-    text = re.sub(r"//.*?$", "", text, flags=re.MULTILINE)       # // ...
-    return text
+    """
+    Remove /* ... */ and // ... comments in one linear pass. Quoted strings are copied
+    through untouched, so a value like "https://..." does not swallow the rest of its line.
+    An unterminated /* comments out the rest.
+    """
+    out: list[str] = []
+    i = 0
+    n = len(text)
+    while i < n:
+        m = _COMMENT_OR_QUOTE_RE.search(text, i)
+        if m is None:
+            out.append(text[i:])
+            break
+        j = m.start()
+        token = m.group()
+        if token == "/*":
+            out.append(text[i:j])
+            k = text.find("*/", j + 2)
+            i = n if k == -1 else k + 2
+        elif token == "//":
+            out.append(text[i:j])
+            k = text.find("\n", j + 2)
+            i = n if k == -1 else k
+        else:
+            k = _end_of_string(text, j)
+            out.append(text[i:k])
+            i = k
+    return "".join(out)
+
+
+def _find_type_and_schema(cfg: str) -> tuple[Optional[str], Optional[str]]:
+    """Return the first `type` and first quoted `schema` values in `cfg`."""
+    tval: Optional[str] = None
+    schema: Optional[str] = None
+    for m in CONFIG_KEY_RE.finditer(cfg):
+        if m.group("type") is not None:
+            tval = tval or m.group("type")
+        else:
+            schema = schema or m.group("schema")
+        if tval and schema:
+            break
+    return tval, schema
+
+
+def _read_config_block(file_path: str | Path) -> Optional[str]:
+    """
+    Read only as much of `file_path` as needed for its config block: the first
+    HEAD_BYTES, plus the rest of the file only when the block is not complete in them.
+    """
+    decoder = codecs.getincrementaldecoder("utf-8")()
+    with open(file_path, "rb") as f:
+        head = f.read(HEAD_BYTES)
+        more = len(head) == HEAD_BYTES
+        # A multi-byte character cut at the boundary is held back until the next read
+        content = decoder.decode(head, final=not more)
+        cfg = _extract_config_block(content)
+        if cfg is None and more:
+            content += decoder.decode(f.read(), final=True)
+            cfg = _extract_config_block(content)
+    return cfg
 
 
-def _display_name(file_path: str) -> str:
-    """Return relative path if inside cwd, else basename."""
-    pth = Path(file_path)
+def _check_one(file_path: str, base: Path) -> tuple[Optional[str], Optional[str]]:
+    """
+    Check a single file, relative to `base`. Returns (error, skip): at most one is set;
+    both None means it passed. Does not print, so it can run on a worker thread.
+    """
+    display = display_name(file_path, base)
+
     try:
-        rel = pth.resolve().relative_to(Path.cwd().resolve())
-        return str(rel)
-    except Exception:
-        return pth.name
+        cfg = _read_config_block(base / file_path)
+    except Exception as e:
+        return f"{display}: Failed to read file. {e}", None
 
+    if not cfg:
+        return f"{display}: Missing or malformed config block.", None
 
-def run(files: List[str]) -> int:
-    has_errors = False
+    cfg = _strip_js_comments(cfg)
+
+    tval, schema = _find_type_and_schema(cfg)
 
-    for file_path in files:
-        path = Path(file_path)
-        display = _display_name(file_path)
+    # Type gate
+    if tval:
+        tval = tval.lower()
+        if tval not in VALID_TYPES:
+            return None, f"Skipped {display} (type is '{tval}')"
 
+    # Enforce explicit quoted schema
+    if not schema or not schema.strip():
+        return f"{display}: Schema must be explicitly set.", None
+
+    return None, None
+
+
+def _check_all(
+    files: List[str], base: Path
+) -> Generator[tuple[Optional[str], Optional[str]], None, None]:
+    """
+    _check_one over `files`, in input order. File reads release the GIL, so several files
+    are checked on a thread pool; a single file is checked inline. Closing the iterator
+    early cancels the checks that have not started yet.
+    """
+    if len(files) < 2:
+        yield from map(_check_one, files, repeat(base))
+        return
+
+    workers = min(32, (os.cpu_count() or 1) * 4, len(files))
+    with ThreadPoolExecutor(max_workers=workers) as ex:
         try:
-            content = path.read_text(encoding="utf-8")
-        except Exception as e:
-            p.error(f"{display}: Failed to read file. {e}")
-            has_errors = True
-            continue
+            yield from ex.map(_check_one, files, repeat(base))
+        finally:
+            ex.shutdown(cancel_futures=True)
+
+
+@p.batch()
+def run(
+    files: List[str],
+    graph: Optional[Dict] = None,
+    *,
+    fail_fast: bool = False,
+    cwd: Optional[Path] = None,
+) -> int:
+    # `graph` is unused: this check reads the SQLX sources directly. It is accepted so that
+    # every check shares the runner's signature. Relative `files` are read from `cwd`
+    # (default: the current directory).
+    base = cwd or Path.cwd()
+    has_errors = False
 
-        cfg = _extract_config_block(content)
-        if not cfg:
-            p.error(f"{display}: Missing or malformed config block.")
-            has_errors = True
-            continue
-
-        cfg = _strip_js_comments(cfg)
-
-        # Type gate
-        m_type = TYPE_RE.search(cfg)
-        if m_type:
-            tval = m_type.group("val").lower()
-            if tval not in VALID_TYPES:
-                p.skip(f"Skipped {display} (type is '{tval}')")
-                continue
-
-        # Enforce explicit quoted schema
-        m_schema = SCHEMA_RE.search(cfg)
-        if not m_schema or not m_schema.group("val").strip():
-            p.error(f"{display}: Schema must be explicitly set.")
-            has_errors = True
+    # Results come back in input order and are printed here to keep output deterministic
+    with closing(_check_all(files, base)) as results:
+        for error, skip in results:
+            if error:
+                p.error(error)
+                has_errors = True
+                if fail_fast:
+                    break
+            elif skip:
+                p.skip(skip)
 
     if has_errors:
         p.footer_fail("Some SQLX files are missing explicit schema.")
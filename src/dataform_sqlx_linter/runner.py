@@ -3,12 +3,14 @@ import argparse
 import json
 import os
 import sys
-from typing import Any, Callable, Optional, TypedDict
+from typing import Any, Optional, Protocol, TypedDict
 
 from .checks.column_descriptions import run as check_columns
 from .checks.description import run as check_description
 from .checks.schema import run as check_schema
 from .checks.hardcoded_fqns import run as check_hardcoded_fqns
+from .utils.io import GraphLoadError, load_compiled_graph_for_files
+from .utils.printing import PRINTER as p
 
 
 class Config(TypedDict, total=False):
@@ -17,13 +19,22 @@ class Config(TypedDict, total=False):
     fail_fast: bool
 
 
-CHECKS: dict[str, Callable[[list[str]], int]] = {
+class Check(Protocol):
+    def __call__(
+        self, files: list[str], graph: Optional[dict], *, fail_fast: bool = False
+    ) -> int: ...
+
+
+CHECKS: dict[str, Check] = {
     "description": check_description,
     "schema": check_schema,
     "columns": check_columns,
     "hardcoded_fqns": check_hardcoded_fqns,
 }
 
+# Checks that read compiled_graph.json (the rest only look at the SQLX sources)
+GRAPH_CHECKS = frozenset({"description", "columns", "hardcoded_fqns"})
+
 
 def _split_csv(s: Optional[str]) -> list[str]:
     return [x.strip() for x in s.split(",")] if s else []
@@ -81,18 +92,15 @@ def cli(argv: Optional[list[str]] = None) -> int:
     exclude = _split_csv(args.exclude) or _split_csv(os.getenv("CHECKS_EXCLUDE")) or file_cfg.get("exclude", [])
     fail_fast = bool(args.fail_fast or (os.getenv("CHECKS_FAIL_FAST") == "1") or file_cfg.get("fail_fast", False))
 
-    # resolve checks
-    selected = set(CHECKS)
-    if include:
-        unknown = [c for c in include if c not in CHECKS]
-        for c in unknown:
-            print(f"⚠️  Unknown check in include: {c}", file=sys.stderr)
-        selected = {c for c in include if c in CHECKS}
-    if exclude:
-        unknown = [c for c in exclude if c not in CHECKS]
-        for c in unknown:
-            print(f"⚠️  Unknown check in exclude: {c}", file=sys.stderr)
-        selected -= {c for c in exclude if c in CHECKS}
+    # resolve checks (CHECKS is read here, not at import, so it can be swapped out)
+    known = frozenset(CHECKS)
+    inc = frozenset(include) if include else known
+    exc = frozenset(exclude)
+    for c in sorted(inc - known):
+        print(f"⚠️  Unknown check in include: {c}", file=sys.stderr)
+    for c in sorted(exc - known):
+        print(f"⚠️  Unknown check in exclude: {c}", file=sys.stderr)
+    selected = (inc & known) - exc
 
     if not selected:
         print("ℹ️  No checks selected.", file=sys.stderr)
@@ -100,9 +108,17 @@ def cli(argv: Optional[list[str]] = None) -> int:
 
     print(f"🔎 Running checks: {', '.join(sorted(selected))}")
     any_fail = False
+    # Parse compiled_graph.json at most once and share it between the graph-based checks.
+    graph: Optional[dict] = None
     for name in sorted(selected):
         print(f"\n——— {name.upper()} ———")
-        rc = CHECKS[name](args.files)
+        try:
+            if name in GRAPH_CHECKS and graph is None:
+                graph = load_compiled_graph_for_files(args.files)
+            rc = CHECKS[name](args.files, graph, fail_fast=fail_fast)
+        except GraphLoadError as e:
+            p.error(str(e))
+            rc = 1
         if rc != 0:
             any_fail = True
             if fail_fast:
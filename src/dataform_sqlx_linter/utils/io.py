@@ -1,36 +1,133 @@
 from __future__ import annotations
 import json
+import mmap
+import os
+import sys
 from pathlib import Path
-from typing import Any, Dict, Iterable, Iterator, List
+from typing import Any, BinaryIO, Dict, Iterable, Iterator, List
 
+try:  # optional dependency: much faster decode, and parses bytes without a str copy
+    import orjson
+except ImportError:  # pragma: no cover - exercised when orjson is not installed
+    orjson = None  # type: ignore[assignment, unused-ignore]
+
+try:  # optional dependency: low-memory parsing for load_compiled_graph_for_files
+    import ijson
+except ImportError:  # pragma: no cover - exercised when ijson is not installed
+    ijson = None
 
 DEFAULT_GRAPH_PATH = "compiled_graph.json"
 
+# Fields kept for tables/actions outside the requested files: enough to resolve an action's
+# name to its target (dependency lookups), without the compiled SQL and descriptors.
+_SLIM_ACTION_KEYS = ("name", "id", "target", "canonicalTarget", "fileName")
+
+# Parsed graphs by absolute path, with the (mtime_ns, size) they were parsed at, so calling
+# the checks repeatedly in one process does not re-parse an unchanged file.
+_GRAPH_CACHE: Dict[str, tuple[tuple[int, int], Dict]] = {}
+
 
 class GraphLoadError(RuntimeError):
     pass
 
 
+def _decode_json_file(f: BinaryIO) -> Any:
+    if orjson is None:
+        return json.loads(f.read().decode("utf-8"))
+    if os.fstat(f.fileno()).st_size == 0:  # an empty file cannot be mapped
+        return orjson.loads(b"")
+    # Let orjson parse straight out of the mapped pages: no bytes copy of the whole file
+    with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm, memoryview(mm) as view:
+        return orjson.loads(view)
+
+
 def load_compiled_graph(path: str | Path = DEFAULT_GRAPH_PATH) -> Dict:
     """
     Load compiled_graph.json and return a dict.
+    The result is cached per path until the file's mtime or size changes.
     Raises GraphLoadError with a friendly message on failure.
     """
     p = Path(path)
+    key = os.path.abspath(p)
     try:
-        text = p.read_text(encoding="utf-8")
+        with p.open("rb") as f:
+            st = os.fstat(f.fileno())
+            stamp = (st.st_mtime_ns, st.st_size)
+            cached = _GRAPH_CACHE.get(key)
+            if cached is not None and cached[0] == stamp:
+                return cached[1]
+            graph = _decode_json_file(f)
     except FileNotFoundError as e:
         raise GraphLoadError(f"Could not find {p}") from e
     except OSError as e:
         raise GraphLoadError(f"Failed reading {p}: {e}") from e
-
-    try:
-        graph = json.loads(text)
-    except json.JSONDecodeError as e:
+    except (json.JSONDecodeError, UnicodeDecodeError) as e:
+        # orjson.JSONDecodeError subclasses json.JSONDecodeError
         raise GraphLoadError(f"Failed to parse {p}: {e}") from e
 
     if not isinstance(graph, dict):
         raise GraphLoadError(f"Unexpected structure in {p}: expected JSON object at top level")
+    _intern_file_names(graph)
+    _GRAPH_CACHE[key] = (stamp, graph)
+    return graph
+
+
+def _intern_file_names(graph: Dict) -> None:
+    """
+    Intern tables'/actions' fileName strings: lookups with (interned) changed-file paths
+    then short-circuit on identity instead of comparing long path strings.
+    """
+    for section in ("tables", "actions"):
+        for item in graph.get(section) or []:
+            fn = item.get("fileName") if isinstance(item, dict) else None
+            if isinstance(fn, str):
+                item["fileName"] = sys.intern(fn)
+
+
+def _slim_action(action: Any, wanted: frozenset[str]) -> Any:
+    if not isinstance(action, dict) or action.get("fileName") in wanted:
+        return action
+    return {k: action[k] for k in _SLIM_ACTION_KEYS if k in action}
+
+
+def load_compiled_graph_for_files(
+    files: Iterable[str], path: str | Path = DEFAULT_GRAPH_PATH
+) -> Dict:
+    """
+    Load the parts of compiled_graph.json needed to check `files`.
+    With orjson installed (or without ijson) this is load_compiled_graph: the fastest load.
+    Otherwise the file is streamed with ijson so only `tables`, `actions` and `sources`
+    are materialized, and tables/actions whose fileName is not in `files` are reduced to
+    their identifying fields: slower than a full stdlib parse, but a fraction of the memory.
+    Raises GraphLoadError with a friendly message on failure.
+    """
+    if orjson is not None or ijson is None:
+        return load_compiled_graph(path)
+
+    wanted = frozenset(map(sys.intern, files))
+    p = Path(path)
+    graph: Dict = {}
+    try:
+        with p.open("rb") as f:
+            first = next(ijson.parse(f), None)
+            if first is None or first[1] != "start_map":
+                raise GraphLoadError(
+                    f"Unexpected structure in {p}: expected JSON object at top level"
+                )
+            for section in ("tables", "actions", "sources"):
+                f.seek(0)
+                items = ijson.items(f, f"{section}.item", use_float=True)
+                if section == "sources":
+                    graph[section] = list(items)
+                else:
+                    graph[section] = [_slim_action(a, wanted) for a in items]
+    except FileNotFoundError as e:
+        raise GraphLoadError(f"Could not find {p}") from e
+    except OSError as e:
+        raise GraphLoadError(f"Failed reading {p}: {e}") from e
+    except ijson.JSONError as e:
+        raise GraphLoadError(f"Failed to parse {p}: {e}") from e
+    _intern_file_names(graph)
     return graph
 
 
@@ -51,15 +148,45 @@ def normalize_changed_files(files: Iterable[str]) -> List[str]:
     return out
 
 
+def display_name(file_path: str, start: str | Path | None = None) -> str:
+    """
+    Return path relative to `start` (default: cwd) if inside it, else basename.
+    A relative `file_path` is taken to be relative to `start`.
+    Pure string work: os.getcwd() is already symlink-free, so no resolve() syscalls.
+    """
+    if start is not None:
+        file_path = os.path.join(start, file_path)
+    try:
+        rel = os.path.relpath(file_path, start)
+    except ValueError:  # e.g. on a different drive (Windows)
+        return os.path.basename(file_path)
+    if rel == os.pardir or rel.startswith(os.pardir + os.sep):
+        return os.path.basename(file_path)
+    return rel
+
+
+def _index_tables_by_file(graph: Dict) -> Dict[str, List[Dict]]:
+    """
+    Map fileName -> tables, built once per graph and cached on it under "__by_file".
+    """
+    index: Dict[str, List[Dict]] | None = graph.get("__by_file")
+    if index is None:
+        index = {}
+        for tbl in (graph.get("tables") or []):
+            fn = tbl.get("fileName")
+            if fn:
+                index.setdefault(fn, []).append(tbl)
+        graph["__by_file"] = index
+    return index
+
+
 def iter_tables_for_files(graph: Dict, files: Iterable[str]) -> Iterator[Dict]:
     """
-    Yield tables from graph.tables whose fileName is in `files`.
+    Yield tables from graph.tables whose fileName is in `files` (in `files` order).
     """
-    targets = set(files)
-    for tbl in (graph.get("tables") or []):
-        fn = tbl.get("fileName")
-        if fn and fn in targets:
-            yield tbl
+    index = _index_tables_by_file(graph)
+    for fn in dict.fromkeys(map(sys.intern, files)):
+        yield from index.get(fn, ())
 
 
 def get_lifecycle_stage(table: dict[str, Any]) -> str | None:
@@ -1,7 +1,11 @@
 from __future__ import annotations
 import os
 import sys
-from dataclasses import dataclass
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from itertools import groupby
+from operator import itemgetter
+from typing import Iterator, Optional
 
 RESET = "\033[0m"
 BOLD = "\033[1m"
@@ -23,32 +27,61 @@ def _supports_color() -> bool:
 @dataclass
 class Printer:
     color: bool = _supports_color()
+    # Set while inside batch(): (is_stderr, line) pairs collected instead of printed
+    _buf: Optional[list[tuple[bool, str]]] = field(default=None, init=False, repr=False)
 
     def _c(self, code: str, text: str) -> str:
         if not self.color:
             return text
         return f"{code}{text}{RESET}"
 
+    def _emit(self, text: str, err: bool = False) -> None:
+        if self._buf is not None:
+            self._buf.append((err, text + "\n"))
+        else:
+            print(text, file=sys.stderr if err else sys.stdout)
+
+    @contextmanager
+    def batch(self) -> Iterator[None]:
+        """
+        Collect everything printed inside the block and write it on exit, one write() per
+        run of consecutive lines to the same stream instead of one print() per message.
+        Runs are written (and flushed) in arrival order, so stdout and stderr lines keep
+        their relative order. Nested batches join the outer one.
+        """
+        if self._buf is not None:
+            yield
+            return
+        self._buf = []
+        try:
+            yield
+        finally:
+            chunks, self._buf = self._buf, None
+            for err, run in groupby(chunks, key=itemgetter(0)):
+                stream = sys.stderr if err else sys.stdout
+                stream.write("".join(text for _, text in run))
+                stream.flush()
+
     # Sections / headers
     def header(self, title: str) -> None:
-        print(self._c(CYAN + BOLD, f"\n——— {title} ———"))
+        self._emit(self._c(CYAN + BOLD, f"\n——— {title} ———"))
 
     # Informational
     def info(self, msg: str) -> None:
-        print(msg)
+        self._emit(msg)
 
     def success(self, msg: str) -> None:
-        print(self._c(GREEN, f"✅ {msg}"))
+        self._emit(self._c(GREEN, f"✅ {msg}"))
 
     def skip(self, msg: str) -> None:
-        print(self._c(CYAN, f"✅ {msg}"))
+        self._emit(self._c(CYAN, f"✅ {msg}"))
 
     # Problems
     def warn(self, msg: str) -> None:
-        print(self._c(YELLOW, f"⚠️  {msg}"), file=sys.stderr)
+        self._emit(self._c(YELLOW, f"⚠️  {msg}"), err=True)
 
     def error(self, msg: str) -> None:
-        print(self._c(RED, f"❌ {msg}"), file=sys.stderr)
+        self._emit(self._c(RED, f"❌ {msg}"), err=True)
 
     # Footers
     def footer_ok(self, msg: str = "All selected checks passed.") -> None:
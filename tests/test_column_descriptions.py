@@ -159,3 +159,23 @@ def test_only_checks_passed_files(write_graph, capsys):
     out, err = capsys.readouterr()
     assert code == 0
     assert err == ""
+
+
+def test_fail_fast_stops_at_first_error(write_graph, capsys):
+    write_graph({
+        "tables": [
+            {
+                "fileName": f"definitions/bad_{i}.sqlx",
+                "actionDescriptor": { "columns": [] },
+                "bigquery": { "labels": { "lifecycle_stage": "prod" } },
+            }
+            for i in range(3)
+        ]
+    })
+    files = [f"definitions/bad_{i}.sqlx" for i in range(3)]
+    code = run_columns(files, fail_fast=True)
+    _, err = capsys.readouterr()
+    assert code == 1
+    assert "bad_0.sqlx is missing defined columns" in err
+    assert "bad_1.sqlx" not in err
+    assert "Some SQLX files are missing column descriptions." in err
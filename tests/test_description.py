@@ -61,3 +61,22 @@ def test_valid_description(write_graph):
     })
     exit_code = run_description(["definitions/ok.sqlx"])
     assert exit_code == 0
+
+
+def test_fail_fast_stops_at_first_error(write_graph, capsys):
+    write_graph({
+        "tables": [
+            {
+                "fileName": f"definitions/bad_{i}.sqlx",
+                "actionDescriptor": {},
+                "bigquery": { "labels": { "lifecycle_stage": "prod" } },
+            }
+            for i in range(3)
+        ]
+    })
+    files = [f"definitions/bad_{i}.sqlx" for i in range(3)]
+    exit_code = run_description(files, fail_fast=True)
+    _, err = capsys.readouterr()
+    assert exit_code == 1
+    assert "Missing description in definitions/bad_0.sqlx" in err
+    assert "bad_1.sqlx" not in err
@@ -1,5 +1,4 @@
 import json
-import os
 from pathlib import Path
 
 import pytest
@@ -9,19 +8,15 @@ from dataform_sqlx_linter.checks.hardcoded_fqns import run as run_fqns
 
 @pytest.fixture
 def write_graph(tmp_path: Path):
-    """Create compiled_graph.json in a temp dir and chdir there."""
-    old = os.getcwd()
-    os.chdir(tmp_path)
-
+    """Create compiled_graph.json in a temp dir (pass `cwd=tmp_path` to run against it)."""
     def _write(graph_dict):
         (tmp_path / "compiled_graph.json").write_text(
             json.dumps(graph_dict), encoding="utf-8"
         )
-    yield _write
-    os.chdir(old)
+    return _write
 
 
-def test_no_actions_for_files_is_ok(write_graph, capsys):
+def test_no_actions_for_files_is_ok(write_graph, tmp_path, capsys):
     # Graph has an action, but we pass a different file name
     write_graph({
         "actions": [
@@ -33,13 +28,13 @@ def test_no_actions_for_files_is_ok(write_graph, capsys):
             }
         ]
     })
-    rc = run_fqns(["definitions/other.sqlx"])
+    rc = run_fqns(["definitions/other.sqlx"], cwd=tmp_path)
     out, err = capsys.readouterr()
     assert rc == 0
     assert "nothing to check" in out.lower()
 
 
-def test_ref_like_dependency_not_flagged(write_graph):
+def test_ref_like_dependency_not_flagged(write_graph, tmp_path):
     # Action a depends on b; compiled query contains ds.b, which is accounted for
     write_graph({
         "actions": [
@@ -58,11 +53,11 @@ def test_ref_like_dependency_not_flagged(write_graph):
             }
         ]
     })
-    rc = run_fqns(["definitions/a.sqlx"])
+    rc = run_fqns(["definitions/a.sqlx"], cwd=tmp_path)
     assert rc == 0
 
 
-def test_sources_are_accounted(write_graph):
+def test_sources_are_accounted(write_graph, tmp_path):
     # Declared source listed in graph.sources is allowed without dependency
     write_graph({
         "actions": [
@@ -77,11 +72,11 @@ def test_sources_are_accounted(write_graph):
             {"target": {"schema": "ext_ds", "name": "ext_table"}}
         ]
     })
-    rc = run_fqns(["definitions/c.sqlx"])
+    rc = run_fqns(["definitions/c.sqlx"], cwd=tmp_path)
     assert rc == 0
 
 
-def test_hardcoded_not_declared_flags(write_graph, capsys):
+def test_hardcoded_not_declared_flags(write_graph, tmp_path, capsys):
     # Action references an external table not covered by dependencies or sources
     write_graph({
         "actions": [
@@ -93,14 +88,14 @@ def test_hardcoded_not_declared_flags(write_graph, capsys):
             }
         ]
     })
-    rc = run_fqns(["definitions/d.sqlx"])
+    rc = run_fqns(["definitions/d.sqlx"], cwd=tmp_path)
     out, err = capsys.readouterr()
     assert rc == 1
     assert "suspected hard-coded table references" in err
     assert "ext_ds.missing_dep" in err
 
 
-def test_information_schema_requires_declaration_fail(write_graph, capsys):
+def test_information_schema_requires_declaration_fail(write_graph, tmp_path, capsys):
     write_graph({
         "actions": [
             {
@@ -111,14 +106,14 @@ def test_information_schema_requires_declaration_fail(write_graph, capsys):
             }
         ]
     })
-    rc = run_fqns(["definitions/e.sqlx"])
+    rc = run_fqns(["definitions/e.sqlx"], cwd=tmp_path)
     out, err = capsys.readouterr()
     assert rc == 1
     assert "suspected hard-coded table references" in err
     assert "ds.INFORMATION_SCHEMA.COLUMNS" in err
 
 
-def test_information_schema_declared_source_ok(write_graph):
+def test_information_schema_declared_source_ok(write_graph, tmp_path):
     write_graph({
         "actions": [
             {
@@ -132,11 +127,11 @@ def test_information_schema_declared_source_ok(write_graph):
             { "target": { "schema": "ds.INFORMATION_SCHEMA", "name": "COLUMNS" } }
         ]
     })
-    rc = run_fqns(["definitions/e.sqlx"])
+    rc = run_fqns(["definitions/e.sqlx"], cwd=tmp_path)
     assert rc == 0
 
 
-def test_ignores_write_targets(write_graph):
+def test_ignores_write_targets(write_graph, tmp_path):
     # CREATE TABLE ds.x AS SELECT * FROM ds.y  -> ds.x is write target, ds.y is read
     # ds.y not declared → should be flagged
     write_graph({
@@ -150,5 +145,181 @@ def test_ignores_write_targets(write_graph):
         ]
     })
     # Still flags ds.y, since it's a read and not declared
-    rc = run_fqns(["definitions/f.sqlx"])
+    rc = run_fqns(["definitions/f.sqlx"], cwd=tmp_path)
+    assert rc == 1
+
+
+def test_all_statements_are_checked(write_graph, tmp_path, capsys):
+    # Pre/post operations compile into multi-statement queries; every statement is scanned
+    write_graph({
+        "actions": [
+            {
+                "name": "g",
+                "fileName": "definitions/g.sqlx",
+                "target": {"schema": "ds", "name": "g"},
+                "compiledQuery": "select 1; select * from ext_ds.second_stmt"
+            }
+        ]
+    })
+    rc = run_fqns(["definitions/g.sqlx"], cwd=tmp_path)
+    _, err = capsys.readouterr()
+    assert rc == 1
+    assert "ext_ds.second_stmt" in err
+
+
+def test_parallel_parsing_matches_sequential(write_graph, tmp_path, capsys, monkeypatch):
+    import dataform_sqlx_linter.checks.hardcoded_fqns as fqns
+
+    monkeypatch.setattr(fqns, "_PARALLEL_MIN_QUERIES", 1)
+    write_graph({
+        "actions": [
+            {
+                "name": f"p{i}",
+                "fileName": f"definitions/p{i}.sqlx",
+                "target": {"schema": "ds", "name": f"p{i}"},
+                # UNNEST sends the query past the regex scan to the parser
+                "compiledQuery": f"select * from ext_ds.t{i % 2} cross join unnest([{i}])"
+            }
+            for i in range(4)
+        ]
+    })
+    rc = run_fqns([f"definitions/p{i}.sqlx" for i in range(4)], cwd=tmp_path)
+    _, err = capsys.readouterr()
+    assert rc == 1
+    lines = [line for line in err.splitlines() if "suspected" in line]
+    assert len(lines) == 4
+    assert "p0.sqlx" in lines[0] and "ext_ds.t0" in lines[0]
+    assert "p1.sqlx" in lines[1] and "ext_ds.t1" in lines[1]
+
+
+def test_regex_scanned_queries_skip_the_process_pool(write_graph, tmp_path, monkeypatch):
+    import dataform_sqlx_linter.checks.hardcoded_fqns as fqns
+
+    def _no_pool():
+        raise AssertionError("process pool started for queries the regex scan answers")
+
+    monkeypatch.setattr(fqns, "_PARALLEL_MIN_QUERIES", 1)
+    monkeypatch.setattr(fqns, "ProcessPoolExecutor", _no_pool)
+    write_graph({
+        "actions": [
+            {
+                "name": f"s{i}",
+                "fileName": f"definitions/s{i}.sqlx",
+                "target": {"schema": "ds", "name": f"s{i}"},
+                "compiledQuery": f"select * from ds.s{i + 1}",
+                "dependencies": [f"s{i + 1}"],
+            }
+            for i in range(3)
+        ] + [{"name": "s3", "target": {"schema": "ds", "name": "s3"}}]
+    })
+    assert run_fqns([f"definitions/s{i}.sqlx" for i in range(3)], cwd=tmp_path) == 0
+
+
+@pytest.mark.parametrize("sql, deferred", [
+    ("select * from ds.b", False),
+    ("select * from `proj.ds.tbl` t join `proj`.ds.other o on t.id = o.id", False),
+    ("select a from my-proj.ds.t where x = 'from ds.fake' -- from ds.comment\n", False),
+    (
+        "with c as (select * from ds.a), d as (select * from c) "
+        "select * from d join ds.e using (id)",
+        False,
+    ),
+    ("select * from ds.a /* join ds.hidden */ left join ds.b on a.x = b.x", False),
+    ("select a, b from ds.t group by a, b", False),
+    ("select f(a, b), [1, 2] from ds.a join ds.b on b.x in (1, 2) order by a, b", False),
+    # correlated array paths, not tables
+    ("select o.id, i.sku from `proj.sales.orders` o cross join o.items i", True),
+    ("select * from ds.t join t.arr", True),
+    ("select * from ds.t as x left join x.arr a", True),
+    # comma joins after a join condition or in a subquery
+    ("select * from ds.a a join ds.b b on a.id = b.id, ds.c c", True),
+    ("select * from ds.a join ds.b using (id), ds.c", True),
+    ("select * from ds.a where exists (select 1 from ds.b, ds.c)", True),
+    # path parts starting with a digit
+    ("select * from ext.2023_events", False),
+    ("select * from proj.ext.2023_t", False),
+    ("select * from `proj`.ext.`2023_t` t join ds.2t on true", False),
+    # parenthesized FROM items that are not subqueries
+    ("select * from (ds.a join ds.b on true)", True),
+    ("select * from ((ds.a))", True),
+    ("select * from ds.a join (ds.b join ds.c on true) on true", True),
+    ("select * from (select * from ds.a) s join ds.b on true", False),
+])
+def test_regex_fast_path_matches_parser(sql, deferred):
+    from dataform_sqlx_linter.checks.hardcoded_fqns import (
+        _extract_read_tables,
+        _parse_read_tables,
+        _scan_read_tables,
+    )
+
+    expected = _parse_read_tables(sql)
+    fast = _scan_read_tables(sql)
+    assert fast is None if deferred else fast == expected
+    assert _extract_read_tables(sql) == expected
+
+
+@pytest.mark.parametrize("sql", [
+    "select * from (select * from ds.a) s, ds.b",
+    "select extract(day from t.ts) from ds.a t",
+    "select * from ds.fn(1)",
+    "create table ds.x as select * from ds.y",
+    "select * from ds.INFORMATION_SCHEMA.COLUMNS",
+])
+def test_regex_fast_path_defers_ambiguous_sql(sql):
+    from dataform_sqlx_linter.checks.hardcoded_fqns import _scan_read_tables
+
+    assert _scan_read_tables(sql) is None
+
+
+def test_action_index_is_cached_on_graph(capsys):
+    graph = {
+        "actions": [
+            {
+                "name": "h",
+                "fileName": "definitions/h.sqlx",
+                "target": {"schema": "ds", "name": "h"},
+                "compiledQuery": "select * from ext_ds.h_src"
+            }
+        ]
+    }
+    assert run_fqns(["definitions/h.sqlx"], graph) == 1
+    index = graph["__fqn_index"]
+    assert run_fqns(["definitions/h.sqlx"], graph) == 1
+    assert graph["__fqn_index"] is index
+
+
+def test_no_matching_actions_skips_indexing(capsys):
+    graph = {
+        "actions": [
+            {
+                "name": "a",
+                "fileName": "definitions/a.sqlx",
+                "target": {"schema": "ds", "name": "a"},
+                "compiledQuery": "select * from proj.ds.x",
+            }
+        ]
+    }
+    assert run_fqns(["definitions/other.sqlx"], graph) == 0
+    assert "__fqn_index" not in graph
+    out, _ = capsys.readouterr()
+    assert "nothing to check" in out.lower()
+
+
+def test_fail_fast_stops_at_first_offender(write_graph, tmp_path, capsys):
+    write_graph({
+        "actions": [
+            {
+                "name": f"f{i}",
+                "fileName": f"definitions/f{i}.sqlx",
+                "target": {"schema": "ds", "name": f"f{i}"},
+                "compiledQuery": f"select * from ext_ds.t{i}",
+            }
+            for i in range(3)
+        ]
+    })
+    files = [f"definitions/f{i}.sqlx" for i in range(3)]
+    rc = run_fqns(files, cwd=tmp_path, fail_fast=True)
+    _, err = capsys.readouterr()
     assert rc == 1
+    assert "f0.sqlx" in err and "ext_ds.t0" in err
+    assert "f1.sqlx" not in err
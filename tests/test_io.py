@@ -0,0 +1,130 @@
+import json
+from pathlib import Path
+
+import pytest
+
+from dataform_sqlx_linter.utils import io
+from dataform_sqlx_linter.utils.io import (
+    GraphLoadError,
+    display_name,
+    iter_tables_for_files,
+    load_compiled_graph,
+    load_compiled_graph_for_files,
+)
+
+
+def _write(tmp_path: Path, graph) -> Path:
+    p = tmp_path / "compiled_graph.json"
+    p.write_text(json.dumps(graph), encoding="utf-8")
+    return p
+
+
+def test_load_compiled_graph_rejects_non_object(tmp_path: Path):
+    p = _write(tmp_path, [1, 2, 3])
+    with pytest.raises(GraphLoadError):
+        load_compiled_graph(p)
+
+
+def test_load_compiled_graph_invalid_json(tmp_path: Path):
+    p = tmp_path / "compiled_graph.json"
+    p.write_text("{not json", encoding="utf-8")
+    with pytest.raises(GraphLoadError, match="Failed to parse"):
+        load_compiled_graph(p)
+
+
+def test_load_for_files_keeps_requested_and_slims_others(tmp_path: Path, monkeypatch):
+    pytest.importorskip("ijson")
+    monkeypatch.setattr(io, "orjson", None)  # streaming is only used without orjson
+    p = _write(tmp_path, {
+        "projectConfig": {"defaultSchema": "ds"},
+        "actions": [
+            {
+                "name": "a",
+                "fileName": "definitions/a.sqlx",
+                "target": {"schema": "ds", "name": "a"},
+                "compiledQuery": "select * from ds.b",
+                "dependencies": ["b"],
+            },
+            {
+                "name": "b",
+                "fileName": "definitions/b.sqlx",
+                "target": {"schema": "ds", "name": "b"},
+                "compiledQuery": "select 1",
+            },
+        ],
+        "sources": [{"target": {"schema": "ext", "name": "t"}}],
+    })
+    graph = load_compiled_graph_for_files(["definitions/a.sqlx"], p)
+    assert "projectConfig" not in graph
+    a, b = graph["actions"]
+    assert a["compiledQuery"] == "select * from ds.b"
+    assert b == {
+        "name": "b",
+        "fileName": "definitions/b.sqlx",
+        "target": {"schema": "ds", "name": "b"},
+    }
+    assert graph["sources"] == [{"target": {"schema": "ext", "name": "t"}}]
+    assert graph["tables"] == []
+
+
+def test_load_for_files_prefers_orjson(tmp_path: Path):
+    pytest.importorskip("orjson")
+    p = _write(tmp_path, {"projectConfig": {}, "actions": []})
+    assert load_compiled_graph_for_files([], p) is load_compiled_graph(p)
+
+
+@pytest.mark.parametrize("disable_orjson", [False, True])
+def test_load_for_files_errors(tmp_path: Path, monkeypatch, disable_orjson):
+    if disable_orjson:
+        monkeypatch.setattr(io, "orjson", None)
+    with pytest.raises(GraphLoadError, match="Could not find"):
+        load_compiled_graph_for_files([], tmp_path / "missing.json")
+    p = _write(tmp_path, [1])
+    with pytest.raises(GraphLoadError):
+        load_compiled_graph_for_files([], p)
+
+
+def test_iter_tables_for_files_uses_cached_index():
+    graph = {
+        "tables": [
+            {"fileName": "definitions/a.sqlx", "name": "a"},
+            {"fileName": "definitions/b.sqlx", "name": "b"},
+            {"name": "no_file"},
+        ]
+    }
+    files = ["definitions/b.sqlx", "definitions/a.sqlx", "definitions/b.sqlx"]
+    assert [t["name"] for t in iter_tables_for_files(graph, files)] == ["b", "a"]
+    assert "__by_file" in graph
+    # The index is reused on subsequent calls
+    graph["tables"] = []
+    assert [t["name"] for t in iter_tables_for_files(graph, ["definitions/a.sqlx"])] == ["a"]
+
+
+def test_display_name_relative_inside_cwd_else_basename(tmp_path: Path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    assert display_name("definitions/a.sqlx") == "definitions/a.sqlx"
+    assert display_name(str(tmp_path / "definitions" / "a.sqlx")) == "definitions/a.sqlx"
+    assert display_name(str(tmp_path.parent / "elsewhere" / "b.sqlx")) == "b.sqlx"
+
+
+def test_display_name_relative_to_start(tmp_path: Path):
+    assert display_name("definitions/a.sqlx", tmp_path) == "definitions/a.sqlx"
+    assert display_name(str(tmp_path / "definitions" / "a.sqlx"), tmp_path) == "definitions/a.sqlx"
+    assert display_name(str(tmp_path.parent / "elsewhere" / "b.sqlx"), tmp_path) == "b.sqlx"
+
+
+def test_load_compiled_graph_empty_file(tmp_path: Path):
+    p = tmp_path / "compiled_graph.json"
+    p.write_bytes(b"")
+    with pytest.raises(GraphLoadError, match="Failed to parse"):
+        load_compiled_graph(p)
+
+
+def test_load_compiled_graph_cached_until_file_changes(tmp_path: Path):
+    p = _write(tmp_path, {"tables": []})
+    first = load_compiled_graph(p)
+    assert load_compiled_graph(p) is first
+    _write(tmp_path, {"tables": [{"fileName": "definitions/a.sqlx"}]})
+    second = load_compiled_graph(p)
+    assert second is not first
+    assert second["tables"] == [{"fileName": "definitions/a.sqlx"}]
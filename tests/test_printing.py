@@ -0,0 +1,48 @@
+from dataform_sqlx_linter.utils.printing import Printer
+
+
+def test_batch_buffers_until_exit(capsys):
+    pr = Printer(color=False)
+    with pr.batch():
+        pr.skip("skipped a")
+        pr.error("broken b")
+        with pr.batch():  # nested batches join the outer one
+            pr.success("done")
+        assert capsys.readouterr() == ("", "")
+    out, err = capsys.readouterr()
+    assert out == "✅ skipped a\n✅ done\n"
+    assert err == "❌ broken b\n"
+
+
+def test_unbatched_prints_immediately(capsys):
+    pr = Printer(color=False)
+    pr.warn("careful")
+    assert capsys.readouterr().err == "⚠️  careful\n"
+
+
+def test_batch_keeps_order_across_streams(monkeypatch):
+    writes = []
+
+    class _Stream:
+        def __init__(self, name):
+            self.name = name
+
+        def write(self, text):
+            writes.append((self.name, text))
+
+        def flush(self):
+            pass
+
+    monkeypatch.setattr("sys.stdout", _Stream("out"))
+    monkeypatch.setattr("sys.stderr", _Stream("err"))
+    pr = Printer(color=False)
+    with pr.batch():
+        pr.skip("a")
+        pr.skip("b")
+        pr.error("c")
+        pr.success("d")
+    assert writes == [
+        ("out", "✅ a\n✅ b\n"),
+        ("err", "❌ c\n"),
+        ("out", "✅ d\n"),
+    ]
@@ -6,32 +6,40 @@ import textwrap
 import dataform_sqlx_linter.runner as runner
 
 
+class _StubCheck:
+    """
+    Stand-in for a check: appends (name, files) to the shared `calls` list, records the
+    (graph, fail_fast) it was given in `args`, and returns `rc`.
+    """
+
+    def __init__(self, name, calls, rc=0):
+        self.name = name
+        self.calls = calls
+        self.rc = rc
+        self.args = []
+
+    def __call__(self, files, graph, fail_fast=False):
+        self.calls.append((self.name, tuple(files)))
+        self.args.append((graph, fail_fast))
+        return self.rc
+
+
 def _stub_checks(monkeypatch, order=None, return_codes=None):
     """
-    Replace runner.CHECKS with simple stub functions that:
+    Replace runner.CHECKS with _StubCheck instances that:
       - append their name to `calls`
       - return a configured exit code (default 0)
     Optionally, enforce an execution order expectation by inspecting `calls`.
+    Graph loading is stubbed as well so no compiled_graph.json is needed.
     """
     calls = []
-
-    def make_check(name):
-        rc = 0
-        if return_codes and name in return_codes:
-            rc = return_codes[name]
-
-        def _fn(files):
-            calls.append((name, tuple(files)))
-            return rc
-
-        return _fn
-
+    return_codes = return_codes or {}
     fake = {
-        "description": make_check("description"),
-        "schema": make_check("schema"),
-        "columns": make_check("columns"),
+        name: _StubCheck(name, calls, return_codes.get(name, 0))
+        for name in ("description", "schema", "columns")
     }
     monkeypatch.setattr(runner, "CHECKS", fake, raising=True)
+    monkeypatch.setattr(runner, "load_compiled_graph_for_files", lambda files: {}, raising=True)
     return calls
 
 
@@ -107,6 +115,16 @@ def test_unknown_names_warn_but_continue(monkeypatch, capsys):
     assert names == ["schema"]
 
 
+def test_unknown_exclude_warns_and_known_still_excluded(monkeypatch, capsys):
+    calls = _stub_checks(monkeypatch)
+    rc = _run_cli(["--exclude", "zzz,schema,aaa", "x.sqlx"])
+    _, err = capsys.readouterr()
+    assert rc == 0
+    warned = [line for line in err.splitlines() if "Unknown check in exclude" in line]
+    assert [line.rsplit(" ", 1)[-1] for line in warned] == ["aaa", "zzz"]
+    assert [n for (n, _) in calls] == ["columns", "description"]
+
+
 def test_config_file_yaml_precedence_overridden_by_cli(tmp_path: Path, monkeypatch, capsys):
     # YAML config selects columns only, but CLI includes description instead
     cfg = tmp_path / "cfg.yml"
@@ -187,3 +205,54 @@ def test_files_are_passed_in_exactly(monkeypatch):
     assert rc == 0
     for _, f in calls:
         assert f == tuple(files)
+
+
+def test_graph_loaded_once_and_shared(monkeypatch):
+    calls = _stub_checks(monkeypatch)
+    loads = []
+    graph = {"tables": []}
+
+    def fake_load(files):
+        loads.append(1)
+        return graph
+
+    monkeypatch.setattr(runner, "load_compiled_graph_for_files", fake_load, raising=True)
+    rc = _run_cli(["x.sqlx"])
+    assert rc == 0
+    assert len(loads) == 1
+    assert len(calls) == 3
+    graph_checks = [runner.CHECKS[n] for n in ("description", "columns")]
+    assert all(g is graph for stub in graph_checks for (g, _) in stub.args)
+
+
+def test_schema_only_does_not_load_graph(monkeypatch):
+    calls = _stub_checks(monkeypatch)
+
+    def fail_load(files):
+        raise runner.GraphLoadError("Could not find compiled_graph.json")
+
+    monkeypatch.setattr(runner, "load_compiled_graph_for_files", fail_load, raising=True)
+    rc = _run_cli(["--include", "schema", "x.sqlx"])
+    assert rc == 0
+    assert [n for (n, _) in calls] == ["schema"]
+
+
+def test_graph_load_error_fails_graph_checks(monkeypatch, capsys):
+    calls = _stub_checks(monkeypatch)
+
+    def fail_load(files):
+        raise runner.GraphLoadError("Could not find compiled_graph.json")
+
+    monkeypatch.setattr(runner, "load_compiled_graph_for_files", fail_load, raising=True)
+    rc = _run_cli(["x.sqlx"])
+    _, err = capsys.readouterr()
+    assert rc == 1
+    assert "Could not find compiled_graph.json" in err
+    assert [n for (n, _) in calls] == ["schema"]
+
+
+def test_fail_fast_is_passed_to_checks(monkeypatch):
+    _stub_checks(monkeypatch)
+    assert _run_cli(["--fail-fast", "--include", "schema", "x.sqlx"]) == 0
+    assert _run_cli(["--include", "schema", "x.sqlx"]) == 0
+    assert [ff for (_, ff) in runner.CHECKS["schema"].args] == [True, False]
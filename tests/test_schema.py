@@ -1,5 +1,4 @@
 from pathlib import Path
-import os
 import pytest
 
 from dataform_sqlx_linter.checks.schema import run as run_schema
@@ -15,12 +14,7 @@ def write_sqlx(tmp_path: Path):
 
 
 def run_in_tmp(tmp_path: Path, files):
-    old = os.getcwd()
-    os.chdir(tmp_path)
-    try:
-        return run_schema([str(f) for f in files])
-    finally:
-        os.chdir(old)
+    return run_schema([str(f) for f in files], cwd=tmp_path)
 
 
 def test_pass_with_explicit_schema_and_type_table(write_sqlx, tmp_path):
@@ -160,3 +154,79 @@ def test_multiple_files_mixed_results(write_sqlx, tmp_path):
     )
     # Overall should fail because of `bad.sqlx`
     assert run_in_tmp(tmp_path, [good, bad, skipped]) == 1
+
+
+def test_pass_config_without_space_before_brace(write_sqlx, tmp_path):
+    f = write_sqlx(
+        "no_space.sqlx",
+        """
+        config{
+          schema: "analytics",
+          type: "table"
+        }
+        select 1;
+        """,
+    )
+    assert run_in_tmp(tmp_path, [f]) == 0
+
+
+def test_errors_reported_in_input_order(write_sqlx, tmp_path, capsys):
+    files = [
+        write_sqlx(f"bad_{i}.sqlx", 'config { type: "view" }\nselect 1;\n')
+        for i in range(8)
+    ]
+    assert run_in_tmp(tmp_path, files) == 1
+    _, err = capsys.readouterr()
+    reported = [line for line in err.splitlines() if "Schema must be explicitly set" in line]
+    assert [f"bad_{i}.sqlx" in line for i, line in enumerate(reported)] == [True] * 8
+
+
+def test_pass_when_url_precedes_schema_on_same_line(write_sqlx, tmp_path):
+    f = write_sqlx(
+        "url_description.sqlx",
+        """
+        config { type: "table", description: "See https://example.com", schema: "web" }
+        select 1;
+        """,
+    )
+    assert run_in_tmp(tmp_path, [f]) == 0
+
+
+def test_config_block_beyond_head_buffer(write_sqlx, tmp_path, monkeypatch):
+    import dataform_sqlx_linter.checks.schema as schema
+
+    monkeypatch.setattr(schema, "HEAD_BYTES", 16)
+    f = write_sqlx(
+        "long_banner.sqlx",
+        "-- banner é " * 20 + '\nconfig {\n  type: "table",\n  schema: "late"\n}\nselect 1;\n',
+    )
+    assert run_in_tmp(tmp_path, [f]) == 0
+
+
+def test_fail_fast_stops_at_first_error(write_sqlx, tmp_path, capsys):
+    files = [
+        write_sqlx(f"ff_{i}.sqlx", 'config { type: "view" }\nselect 1;\n')
+        for i in range(4)
+    ]
+    rc = run_schema([str(f) for f in files], fail_fast=True, cwd=tmp_path)
+    _, err = capsys.readouterr()
+    assert rc == 1
+    assert "ff_0.sqlx" in err
+    assert "ff_1.sqlx" not in err
+
+
+def test_braces_in_comments_and_strings_do_not_unbalance(write_sqlx, tmp_path):
+    f = write_sqlx(
+        "braces_in_comments.sqlx",
+        """
+        config {
+          type: "table",
+          // a stray } in a line comment
+          /* and { in a block comment */
+          description: "uses } and { in text",
+          schema: "analytics"
+        }
+        select 1;
+        """,
+    )
+    assert run_in_tmp(tmp_path, [f]) == 0